@@ -80,8 +80,15 @@ class CommandManager:
                              extra_config={'GLOBAL': opt_vals})
         commander.BIN_NAME = 'doit'
 
+        args = ['--verbosity', '2']
+        jobs = builder.prepare_jobs
+        bos_dodo.jobs = jobs
+        if jobs > 1:
+            # run independent tasks (e.g. cloning of repositories) in parallel
+            args.extend(('--process', str(jobs), '--parallel-type', 'thread'))
+
         logging.info('Preparing LEDE build system...')
-        commander.run(['--verbosity', '2', task])
+        commander.run(args + [task])
 
     def get_builder(self, task=None):
         """
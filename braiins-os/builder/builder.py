@@ -29,10 +29,15 @@ import gzip
 import git
 import io
 import os
+import errno
+import posixpath
 import sys
 import glob
 import filecmp
 import tempfile
+import hashlib
+import re
+import mmap
 
 import builder.nand as nand
 
@@ -41,6 +46,7 @@ from collections import OrderedDict, namedtuple
 from contextlib import contextmanager
 from termcolor import colored
 from functools import partial
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from doit.tools import run_once, config_changed, check_timestamp_unchanged
 from urllib.request import Request, urlopen
@@ -74,6 +80,30 @@ def get_stream_size(stream):
     return stream_size
 
 
+def copy_file(src, dst, block_size=1024 * 1024):
+    """
+    Copy content of the file without its metadata
+
+    The data are copied in kernel by `os.sendfile` without user space buffers when it is supported.
+    Otherwise the file is copied by `shutil.copyfileobj`.
+    """
+    with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+        size = os.fstat(src_file.fileno()).st_size
+        offset = 0
+        try:
+            while offset < size:
+                sent = os.sendfile(dst_file.fileno(), src_file.fileno(), offset,
+                                   min(block_size, size - offset))
+                if not sent:
+                    break
+                offset += sent
+            return
+        except OSError as e:
+            if offset or e.errno not in (errno.EINVAL, errno.ENOSYS):
+                raise
+        shutil.copyfileobj(src_file, dst_file, block_size)
+
+
 class Builder:
     """
     Main class for building the bOS firmware based on the LEDE (OpenWRT) project.
@@ -194,6 +224,16 @@ class Builder:
         LEDE_USIGN: os.path.join('staging_dir', 'host', 'bin', 'usign')
     }
 
+    # default number of tasks run simultaneously during preparation of repositories
+    PREPARE_JOBS_MAX = 8
+    # maximal number of repositories queried simultaneously for their status
+    STATUS_JOBS_MAX = 8
+    COMMIT_HASH = re.compile(r'^[0-9a-f]{7,40}$')
+    CONFIG_GLIBC = re.compile(rb'^CONFIG_LIBC="glibc"', re.MULTILINE)
+
+    # maximal number of images uploaded simultaneously to the remote device
+    DEPLOY_UPLOAD_JOBS = 4
+
     # configuration file constants
     CONFIG_DEVICES = ['nand', 'recovery', 'sd', 'upgrade']
     PACKAGE_LIST_PREFIX = 'image_'
@@ -468,9 +508,14 @@ class Builder:
         self._build_dir = os.path.join(os.path.abspath(self._config.build.dir), self._config.build.name)
         # add build_dir tag after it has been initialized
         self._config.formatter.add_tag('build_dir', self._build_dir)
+        # cached paths derived from immutable configuration
+        self._repo_paths = {}
+        self._config_paths = None
         # set working directory to LEDE root directory
         self._working_dir = self._get_repo_path(self.REPO_LEDE)
         self._tmp_dir = os.path.join(self._working_dir, 'tmp')
+        self._glibc = None
+        self._env_cache = {}
         self._repos = OrderedDict()
         self._init_repos()
         self._generated_configs = self._get_generated_configs()
@@ -489,6 +534,19 @@ class Builder:
         """
         return self._config
 
+    @property
+    def prepare_jobs(self):
+        """
+        Return number of tasks which can be run simultaneously during preparation
+
+        Cloning and fetching of repositories is network bound and independent for each repository so these tasks are
+        run in parallel. The number of jobs is set by `remote.jobs` (default is `PREPARE_JOBS_MAX`) and it is limited
+        by the number of repositories.
+        """
+        jobs = int(self._config.remote.get('jobs', self.PREPARE_JOBS_MAX))
+        remotes = sum(1 for _ in RemoteWalker(self._config.remote, self._config.bos.platform))
+        return max(1, min(remotes, jobs))
+
     def _run(self, *args, path=None, input=None, output=False, init=None):
         """
         Run system command in LEDE source directory
@@ -517,23 +575,77 @@ class Builder:
         :return:
             Captured stdout when `output` argument is set to True.
         """
-        env = None
-        cwd = self._working_dir
+        args, cwd, env = self._prepare_command(args, path)
         stdout = subprocess.PIPE if output else None
 
-        if path:
+        process = subprocess.run(args, input=input, stdout=stdout, check=True, cwd=cwd, env=env, preexec_fn=init)
+        if output:
+            return process.stdout
+
+    def _prepare_command(self, args, path=None):
+        """
+        Return arguments, working directory and environment for system command run in LEDE source directory
+
+        :param args:
+            Command and its arguments in the same form as for the method `_run`.
+        :param path:
+            List of directories prepended to PATH environment variable.
+        :return:
+            Tuple with list of arguments, working directory and environment.
+        """
+        cwd = self._working_dir
+        env = self._get_env(path)
+
+        if isinstance(args[0], (list, tuple)):
+            args = args[0]
+
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            if env:
+                logging.debug("Set PATH environment variable to '{}'".format(env['PATH']))
+            logging.debug("Run '{}' in '{}'".format(' '.join(args), cwd))
+        return args, cwd, env
+
+    def _get_env(self, path=None):
+        """
+        Return environment for system command with altered PATH environment variable
+
+        The environment is created only once for each list of directories and then it is reused.
+
+        :param path:
+            List of directories prepended to PATH environment variable.
+        :return:
+            Dictionary with environment variables or None when current environment should be used.
+        """
+        if not path:
+            return None
+        key = tuple(path)
+        env = self._env_cache.get(key)
+        if env is None:
             env = os.environ.copy()
             env['PATH'] = ':'.join((*path, env['PATH']))
-        if type(args[0]) is list:
-            args = args[0]
-        if path:
-            logging.debug("Set PATH environment variable to '{}'".format(env['PATH']))
+            self._env_cache[key] = env
+        return env
 
-        logging.debug("Run '{}' in '{}'".format(' '.join(args), cwd))
+    @contextmanager
+    def _pipe(self, *args, path=None):
+        """
+        Run system command in LEDE source directory and stream its standard output
 
-        process = subprocess.run(args, input=input, stdout=stdout, check=True, cwd=cwd, env=env, preexec_fn=init)
-        if output:
-            return process.stdout
+        The exit status of the command is checked when the context is left and an exception is raised on error.
+
+        :param args:
+            Command and its arguments in the same form as for the method `_run`.
+        :param path:
+            List of directories prepended to PATH environment variable.
+        :return:
+            Text stream with standard output of the command decoded as UTF-8.
+        """
+        args, cwd, env = self._prepare_command(args, path)
+
+        with subprocess.Popen(args, stdout=subprocess.PIPE, cwd=cwd, env=env) as process:
+            yield io.TextIOWrapper(process.stdout, encoding='utf-8')
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, args)
 
     def get_firmware_version(self, short=False, local_time=False) -> str:
         """
@@ -591,6 +703,19 @@ class Builder:
         """
         return self._repos[name]
 
+    def _get_repo_by_path(self, path: str):
+        """
+        Return git repository which is stored in specified directory
+
+        :param path: Path to the repository working directory.
+        :return: Associated git repository or None when the directory does not contain any known repository.
+        """
+        path = os.path.realpath(path)
+        for repo in self._repos.values():
+            if repo and os.path.realpath(repo.working_dir) == path:
+                return repo
+        return None
+
     def _get_repo_path(self, name: str) -> str:
         """
         Return absolute path to repository specified by its name
@@ -598,7 +723,10 @@ class Builder:
         :param name: The name of repository as it has been specified in configuration file.
         :return: Absolute path to the repository.
         """
-        return os.path.join(self._build_dir, name)
+        path = self._repo_paths.get(name)
+        if path is None:
+            path = self._repo_paths[name] = os.path.join(self._build_dir, name)
+        return path
 
     def _get_config_paths(self):
         """
@@ -610,20 +738,31 @@ class Builder:
         :return:
             Pair of absolute paths to default and current configuration file.
         """
-        config_src_path = os.path.abspath(self._config.build.config)
-        config_dst_path = os.path.join(self._working_dir, self.CONFIG_NAME)
-        return config_src_path, config_dst_path
+        if self._config_paths is None:
+            config_src_path = os.path.abspath(self._config.build.config)
+            config_dst_path = os.path.join(self._working_dir, self.CONFIG_NAME)
+            self._config_paths = config_src_path, config_dst_path
+        return self._config_paths
 
     def _use_glibc(self):
         """
         Check if glibc is used for build
 
+        The result is cached because the configuration file does not change during the builder lifetime.
+
         :return:
             True when configuration file is set for use of glibc.
         """
-        config_path, _ = self._get_config_paths()
-        with open(config_path, 'r') as config:
-            return any((line.startswith('CONFIG_LIBC="glibc"') for line in config))
+        if self._glibc is None:
+            config_path, _ = self._get_config_paths()
+            with open(config_path, 'rb') as config:
+                if not os.fstat(config.fileno()).st_size:
+                    # empty file cannot be mapped
+                    self._glibc = False
+                else:
+                    with mmap.mmap(config.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                        self._glibc = self.CONFIG_GLIBC.search(data) is not None
+        return self._glibc
 
     def _get_hostname(self) -> str:
         """
@@ -677,15 +816,100 @@ class Builder:
         if error:
             raise BuilderStop
 
-    def _clone_repo_doit(self, remote):
+    def _get_repo_cache(self, uri: str, progress=None):
+        """
+        Return path to local mirror of remote repository
+
+        The mirror is shared among all builds and it is created when it does not exist yet or updated otherwise.
+        The directory with mirrors is specified in `remote.cache_dir` and the cache is disabled when it is not set.
+
+        :param uri:
+            Address of remote git repository.
+        :param progress:
+            Progress printer passed to git.
+        :return:
+            Path to the bare mirror or None when cache is disabled or cannot be used.
+        """
+        cache_dir = self._config.remote.get('cache_dir', None)
+        if not cache_dir:
+            return None
+
+        cache_name = '{}.git'.format(hashlib.sha1(uri.encode()).hexdigest())
+        cache_path = os.path.join(os.path.abspath(os.path.expanduser(cache_dir)), cache_name)
+        try:
+            if os.path.isdir(cache_path):
+                logging.debug("Updating mirror of '{}' in '{}'".format(uri, cache_path))
+                git.Repo(cache_path).git.fetch('--prune')
+            else:
+                logging.debug("Creating mirror of '{}' in '{}'".format(uri, cache_path))
+                git.Repo.clone_from(uri, cache_path, mirror=True, progress=progress)
+        except (git.exc.GitCommandError, git.exc.InvalidGitRepositoryError):
+            logging.warning("Cannot use mirror of '{}' in '{}'".format(uri, cache_path))
+            return None
+        return cache_path
+
+    def _clone_repo(self, uri: str, path: str, progress=None, branch: str=None, shallow: bool=False) -> git.Repo:
+        """
+        Clone remote repository to the local path
+
+        Objects are borrowed from the local mirror of remote repository (when the cache is enabled) so only missing
+        objects are downloaded from the network. The clone is dissociated from the mirror afterwards so it does not
+        depend on the cache.
+
+        :param uri:
+            Address of remote git repository.
+        :param path:
+            Path to the local repository.
+        :param progress:
+            Progress printer passed to git.
+        :param branch:
+            Name of branch or tag for shallow clone.
+        :param shallow:
+            Clone only the tip of the branch without history.
+            The mirror is not used because it always contains the whole history.
+        :return:
+            Cloned git repository.
+        """
+        kwargs = {}
+        if shallow:
+            if branch and not self.COMMIT_HASH.match(branch):
+                return git.Repo.clone_from(uri, path, progress=progress, branch=branch, depth=1, single_branch=True)
+            # specific commit cannot be cloned directly
+            logging.warning("Shallow clone of '{}' requires branch or tag instead of '{}'".format(uri, branch))
+        cache_path = self._get_repo_cache(uri, progress)
+        if cache_path:
+            kwargs.update(reference_if_able=cache_path, dissociate=True)
+        return git.Repo.clone_from(uri, path, progress=progress, **kwargs)
+
+    def _clone_repo_doit(self, remote, progress):
         """
         Clone repository when it is missing or remote server is changed
 
         :param remote:
             Named tuple with information about remote repository.
+        :param progress:
+            Print progress of cloning.
         :return:
             Generator returning dictionary with dependencies and action for doit task.
         """
+        def shallow_unchanged(task, values):
+            """
+            Check if branch of shallow clone is unchanged
+
+            Shallow clone contains only the requested branch so it has to be cloned again when the branch is changed.
+            Full clones are always stored with an empty value so existing repositories are not cloned again.
+            """
+            shallow_key = 'shallow_branch'
+            shallow_branch = None
+            if remote.shallow and remote.branch and not self.COMMIT_HASH.match(remote.branch):
+                shallow_branch = remote.branch
+
+            def save_now():
+                return {shallow_key: shallow_branch}
+            task.value_savers.append(save_now)
+
+            return values.get(shallow_key) == shallow_branch
+
         name = remote.name
         path = self._get_repo_path(name)
         repo = self._repos[name]
@@ -693,30 +917,37 @@ class Builder:
         yield {
             'name': name,
             'uptodate': [config_changed(repo.remotes.origin.url if repo else ''),
-                         config_changed(remote.uri)]
+                         config_changed(remote.uri),
+                         shallow_unchanged]
         }
 
         repo = self._repos[name]
         if repo and (repo.is_dirty(untracked_files=True) or
                      (not repo.head.is_detached and self._count_commits(repo)[0] != 0)):
             # old repo exists and should not be removed when there are changes
-            logging.error("URI of repository '{}' has changed but new repository cannot be fetched due to local changes"
-                          .format(name))
+            logging.error("URI or shallow branch of repository '{}' has changed but new repository cannot be fetched "
+                          "due to local changes".format(name))
             raise BuilderStop
 
         shutil.rmtree(path, ignore_errors=True)
-        repo = git.Repo.clone_from(remote.uri, path, progress=RepoProgressPrinter())
+        if not progress:
+            logging.info("Cloning repository '{}'...".format(name))
+        repo = self._clone_repo(remote.uri, path, progress=RepoProgressPrinter() if progress else None,
+                                branch=remote.branch, shallow=remote.shallow)
         self._repos[name] = repo
 
-    def clone_repos_doit(self):
+    def clone_repos_doit(self, progress=True):
         """
         Clone all repositories
 
+        :param progress:
+            Print progress of cloning. It should be disabled when repositories are cloned in parallel because
+            progress bars would be interleaved.
         :return:
             List of generators used for doit task.
         """
         for remote in RemoteWalker(self._config.remote, self._config.bos.platform):
-            yield self._clone_repo_doit(remote)
+            yield self._clone_repo_doit(remote, progress)
 
     def _checkout_repo(self, repo, remote):
         """
@@ -739,14 +970,15 @@ class Builder:
                 True when checkout was successful or False when branch or commit does not exist
             """
             origin = repo.remotes.origin
-            if remote.branch in repo.heads:
-                head = repo.heads[remote.branch]
+            # look up each list of references only once
+            head = next((head for head in repo.heads if head.name == remote.branch), None)
+            if head is not None:
                 head.checkout()
                 if remote.fetch:
                     origin.pull()
                 return True
-            if remote.branch in origin.refs:
-                ref = origin.refs[remote.branch]
+            ref = next((ref for ref in origin.refs if ref.remote_head == remote.branch), None)
+            if ref is not None:
                 head = repo.create_head(remote.branch, ref)
                 head.set_tracking_branch(ref)
                 head.checkout()
@@ -761,16 +993,21 @@ class Builder:
 
             # try to checkout head from local repository when fetch is disabled
 
+        jobs = str(self._config.build.jobs)
         if remote.fetch or not head_checkout():
             # fetch remote repository when fetch is enabled or local checkout wasn't successful
-            for repo_remote in repo.remotes:
-                repo_remote.fetch()
+            # all remotes are fetched by one git command which can also fetch submodules in parallel
+            repo.git.fetch('--all', '--jobs', jobs)
 
             # try checkout after remote fetch (it is second attempt when fetch is disabled)
             if not head_checkout():
                 logging.error("Cannot checkout branch '{}'".format(remote.branch))
                 raise BuilderStop
 
+        if repo.submodules:
+            # submodules have to follow every checkout including the local one
+            repo.git.submodule('update', '--init', '--recursive', '--jobs', jobs)
+
     def _checkout_repo_doit(self, remote):
         """
         Switch branches or pull it from remote repository
@@ -784,8 +1021,9 @@ class Builder:
             """
             Return reference to local branch or commit when exists otherwise return None
             """
-            if remote.branch in repo.heads:
-                return repo.heads[remote.branch]
+            head = next((head for head in repo.heads if head.name == remote.branch), None)
+            if head is not None:
+                return head
             try:
                 return repo.commit(remote.branch)
             except (git.BadName, ValueError):
@@ -817,6 +1055,32 @@ class Builder:
         for remote in RemoteWalker(self._config.remote, self._config.bos.platform):
             yield self._checkout_repo_doit(remote)
 
+    def get_feeds_repos(self):
+        """
+        Return names of repositories which are used as local feeds
+
+        A feeds link can point to the repository itself or to any directory inside it.
+
+        :return:
+            List of repository names from `remote.repos` which are linked in `feeds.links` or None when some link
+            points to the build directory outside of all known repositories.
+        """
+        build_dir = os.path.realpath(self._build_dir)
+        repo_paths = [(remote.name, os.path.realpath(self._get_repo_path(remote.name)))
+                      for remote in RemoteWalker(self._config.remote, self._config.bos.platform)]
+        feeds_repos = []
+        for _, feeds_link in self._config.feeds.links.items():
+            feeds_path = os.path.realpath(feeds_link)
+            name = next((name for name, repo_path in repo_paths
+                         if os.path.commonpath((feeds_path, repo_path)) == repo_path), None)
+            if name is None:
+                if os.path.commonpath((feeds_path, build_dir)) == build_dir:
+                    # the feeds can be created by any repository
+                    return None
+            elif name not in feeds_repos:
+                feeds_repos.append(name)
+        return feeds_repos
+
     def prepare_feeds_conf_doit(self):
         """
         Prepare LEDE feeds
@@ -827,18 +1091,30 @@ class Builder:
             Generator returning dictionary with dependencies and action for doit task.
         """
         feeds_path = os.path.join(self._working_dir, self.FEEDS_CONF)
-        feeds_links = self._config.feeds.links
+        feeds_config = self._config.feeds
+        feeds_links = feeds_config.links
 
         yield {
             'targets': [feeds_path],
-            'uptodate': [self._config.feeds.create_always != 'yes',
+            'uptodate': [feeds_config.create_always != 'yes',
                          config_changed({name: link for name, link in feeds_links.items()})]
         }
 
+        feeds_conf = ''.join('src-link {} {}\n'.format(feeds_name, feeds_link)
+                             for feeds_name, feeds_link in feeds_links.items()).encode()
+
+        # keep the file untouched when its content is the same
+        try:
+            with open(feeds_path, 'rb') as feeds_file:
+                if feeds_file.read() == feeds_conf:
+                    logging.debug("File '{}' is up to date".format(feeds_path))
+                    return
+        except FileNotFoundError:
+            pass
+
         logging.debug("Creating '{}'".format(feeds_path))
-        with open(feeds_path, 'w') as feeds_file:
-            for feeds_name, feeds_link in feeds_links.items():
-                feeds_file.write('src-link {} {}\n'.format(feeds_name, feeds_link))
+        with open(feeds_path, 'wb') as feeds_file:
+            feeds_file.write(feeds_conf)
 
     def prepare_feeds_update_doit(self):
         """
@@ -901,12 +1177,37 @@ class Builder:
             prev_count = values.get(config_files_key)
             return result and prev_count == count
 
+        def feeds_unchanged(task, values):
+            """
+            Check if feeds are unchanged
+
+            Feeds stored in a clean git repository are identified by commit hash of its head. It is more reliable than
+            timestamps of files which are reset by every checkout. Feeds with local changes or outside of any
+            repository are checked by timestamps of configuration files.
+            """
+            head_key = 'head'
+            head = None
+
+            repo = self._get_repo_by_path(link)
+            if repo and not repo.is_dirty(untracked_files=True):
+                head = repo.head.commit.hexsha
+
+            def save_now():
+                return {head_key: head}
+            task.value_savers.append(save_now)
+
+            if head:
+                return values.get(head_key) == head
+            return config_files_unchanged(task, values)
+
+        feeds_config = self._config.feeds
+
         yield {
             'name': name,
             'file_dep': [os.path.join(self._working_dir, self.FEEDS_CONF)],
-            'uptodate': [self._config.feeds.update_always != 'yes',
-                         self._config.feeds.install_always != 'yes',
-                         config_files_unchanged]
+            'uptodate': [feeds_config.update_always != 'yes',
+                         feeds_config.install_always != 'yes',
+                         feeds_unchanged]
         }
 
         logging.debug('Installing feeds {}'.format(name))
@@ -975,7 +1276,7 @@ class Builder:
         }
 
         logging.debug("Copy config from '{}'".format(config_src_path))
-        shutil.copy(config_src_path, config_dst_path)
+        copy_file(config_src_path, config_dst_path)
 
         with open(config_dst_path, 'a') as config_dst_file:
             shutil.copyfileobj(target_config, config_dst_file)
@@ -1013,8 +1314,10 @@ class Builder:
                 shutil.rmtree(base_file_dir)
             # delete previous key
             logging.debug("Delete {} build key'".format(attribute, key_src_path))
-            if os.path.exists(key_dst_path):
+            try:
                 os.remove(key_dst_path)
+            except FileNotFoundError:
+                pass
 
     def prepare_keys_doit(self):
         """
@@ -1043,15 +1346,15 @@ class Builder:
             return
 
         logging.info("Saving changes in configuration to '{}'...".format(config_dst_path))
-        with open(config_dst_path, 'w') as config_dst:
+        generated_configs = tuple(config for config, _ in self._generated_configs)
+        with open(config_dst_path, 'w') as config_dst, \
+                self._pipe(os.path.join('scripts', 'diffconfig.sh')) as output:
             # call ./scripts/diffconfig.sh to get configuration diff
-            output = self._run(os.path.join('scripts', 'diffconfig.sh'), output=True)
-            for line in output.decode('utf-8').splitlines():
+            for line in output:
                 # do not store lines with configuration of external directories
                 # this files are automatically generated
-                if not any(line.startswith(config) for config, _ in self._generated_configs):
+                if not line.startswith(generated_configs):
                     config_dst.write(line)
-                    config_dst.write('\n')
 
     def _config_kernel(self):
         """
@@ -1268,34 +1571,66 @@ class Builder:
                 remote += '.gz'
             upload_manager.put(local, remote, compress)
 
-    def _deploy_ssh_sd(self, ssh, sftp, image, recovery: bool):
+    def _deploy_ssh_sd(self, ssh, image, recovery: bool):
         """
         Deploy image to the SD card over SSH connection
 
+        All images are uploaded concurrently. The transfer method is selected by `deploy.ssh.transfer`:
+
+        - `sftp` - each upload uses its own SFTP session of the connected SSH client (default)
+        - `scp` - images are transferred by external `scp` with compression; the remote device has to accept
+          connection without password prompt and unknown host key is accepted like for the SSH client
+
         :param ssh:
             Connected SSH client.
-        :param sftp:
-            Opened SFTP connection by SSH client.
         :param image:
             Paths to firmware images.
         :param recovery:
             Transfer recovery images.
         """
+        target_dir = '/mnt'
+
+        def sftp_put(src, dst):
+            # SFTP client is not thread safe so every upload opens new session
+            sftp = ssh.open_sftp()
+            try:
+                sftp.chdir(target_dir)
+                sftp.put(src, dst)
+            finally:
+                sftp.close()
+
+        def scp_put(src, dst):
+            remote = '{}@{}:{}'.format(ssh.username, ssh.hostname, posixpath.join(target_dir, dst))
+            # freshly flashed device is usually missing in 'known_hosts' and it is accepted by SSH client as well
+            self._run('scp', '-C', '-q', '-o', 'BatchMode=yes', '-o', 'StrictHostKeyChecking=no',
+                      os.path.abspath(src), remote)
+
         class UploadManager:
-            def __init__(self, sftp):
-                self.sftp = sftp
+            def __init__(self, executor, transfer):
+                self.executor = executor
+                self.transfer = transfer
+                self.uploads = []
 
             def put(self, src, dst, compress=False, cache=None):
                 logging.info("Uploading '{}'...".format(dst))
-                self.sftp.put(src, dst)
+                self.uploads.append(self.executor.submit(self.transfer, src, dst))
 
-        ssh.run('mount', '/dev/mmcblk0p1', '/mnt')
-        sftp.chdir('/mnt')
+        transfer = self._config.deploy.ssh.get('transfer', 'sftp')
+        if transfer not in ('sftp', 'scp'):
+            logging.error("Unsupported transfer method '{}'".format(transfer))
+            raise BuilderStop
+
+        ssh.run('mount', '/dev/mmcblk0p1', target_dir)
 
         # start uploading
-        self._upload_images(UploadManager(sftp), image, recovery)
+        with ThreadPoolExecutor(max_workers=self.DEPLOY_UPLOAD_JOBS) as executor:
+            upload_manager = UploadManager(executor, scp_put if transfer == 'scp' else sftp_put)
+            self._upload_images(upload_manager, image, recovery)
+            # propagate the first failed upload
+            for upload in as_completed(upload_manager.uploads):
+                upload.result()
 
-        ssh.run('umount', '/mnt')
+        ssh.run('umount', target_dir)
 
     def _deploy_ssh_nand_recovery(self, ssh, image):
         """
@@ -1359,9 +1694,11 @@ class Builder:
             ('nand_firmware1', 1),
             ('nand_firmware2', 2)
         )
-        targets = self._config.deploy.targets
+        deploy_config = self._config.deploy
+        targets = deploy_config.targets
+        factory_image = deploy_config.factory_image == 'yes'
 
-        if self._config.deploy.write_bitstream == 'yes':
+        if deploy_config.write_bitstream == 'yes':
             mtds = (self._get_bitstream_mtd_name(i) for name, i in firmwares if name in targets)
             for mtd_name in mtds:
                 logging.info("Writing bitstream for platform '{}' to NAND partition '{}'..."
@@ -1370,7 +1707,7 @@ class Builder:
 
         mtds = ((name[5:], self._get_firmware_mtd(i)) for name, i in firmwares if name in targets)
         for firmware, mtd in mtds:
-            if self._config.deploy.factory_image == 'yes':
+            if factory_image:
                 logging.info("Formating '{}' ({}) with 'factory.bin'...".format(firmware, mtd))
                 # erase device before formating
                 ssh.run('mtd', 'erase', mtd)
@@ -1408,8 +1745,9 @@ class Builder:
         :param recovery:
             Use options for recovery image.
         """
-        reset_extroot = self._config.deploy.reset_extroot == 'yes'
-        remove_extroot_uuid = self._config.deploy.remove_extroot_uuid == 'yes'
+        deploy_config = self._config.deploy
+        reset_extroot = deploy_config.reset_extroot == 'yes'
+        remove_extroot_uuid = deploy_config.remove_extroot_uuid == 'yes'
 
         # create uEnv.txt for U-Boot external configuration
         ssh.run('mount', '/dev/mmcblk0p1', '/mnt')
@@ -1419,17 +1757,21 @@ class Builder:
         with sftp.open(self.UENV_TXT, 'w') as file:
             self._write_uenv(file, recovery)
 
-        ssh.run('umount', '/mnt')
-
         # delete the whole extroot or delete extroot UUID
-        if reset_extroot or remove_extroot_uuid:
-            ssh.run('mount', '/dev/mmcblk0p2', '/mnt')
+        if not (reset_extroot or remove_extroot_uuid):
+            ssh.run('umount', '/mnt')
+        elif reset_extroot:
+            logging.info("Removing all data from extroot...")
+            ssh.run_all(['umount', '/mnt'],
+                        ['mount', '/dev/mmcblk0p2', '/mnt'],
+                        ['rm', '-fr', '/mnt/*'],
+                        ['umount', '/mnt'])
+        else:
+            ssh.run_all(['umount', '/mnt'],
+                        ['mount', '/dev/mmcblk0p2', '/mnt'])
             sftp.chdir('/mnt')
 
-            if reset_extroot:
-                logging.info("Removing all data from extroot...")
-                ssh.run('rm', '-fr', '/mnt/*')
-            elif '.extroot-uuid' in sftp.listdir('etc'):
+            if '.extroot-uuid' in sftp.listdir('etc'):
                 logging.info("Removing extroot UUID...")
                 sftp.remove('etc/.extroot-uuid')
 
@@ -1442,8 +1784,12 @@ class Builder:
         :param ssh:
             Connected SSH client.
         """
+        deploy_config = self._config.deploy
+        reset_uboot_env = deploy_config.reset_uboot_env == 'yes'
+        reset_overlay = deploy_config.reset_overlay == 'yes'
+
         # write bOS configuration to NAND
-        if self._config.deploy.write_bos_cfg == 'yes':
+        if deploy_config.write_bos_cfg == 'yes':
             bos_cfg_input = io.BytesIO()
             if not nand.write_miner_cfg_input(self._config, bos_cfg_input):
                 raise BuilderStop
@@ -1456,32 +1802,35 @@ class Builder:
                 remote.stdin.write(output)
 
         # change bOS configuration in U-Boot env
-        if self._config.deploy.set_bos_env == 'yes' and self._config.deploy.reset_uboot_env == 'no':
+        if deploy_config.set_bos_env == 'yes' and deploy_config.reset_uboot_env == 'no':
             logging.info("Writing bOS configuration to U-Boot env in NAND...")
-            ssh.run('fw_setenv', nand.NET_MAC, self._config.net.mac)
-            ssh.run('fw_setenv', nand.MINER_HWID, self._config.bos.hwid)
-            ssh.run('fw_setenv', nand.MINER_FIRMWARE, str(self._config.bos.firmware))
-
-        reset_uboot_env = self._config.deploy.reset_uboot_env == 'yes'
-        reset_overlay = self._config.deploy.reset_overlay == 'yes'
+            ssh.run_all(['fw_setenv', nand.NET_MAC, self._config.net.mac],
+                        ['fw_setenv', nand.MINER_HWID, self._config.bos.hwid],
+                        ['fw_setenv', nand.MINER_FIRMWARE, str(self._config.bos.firmware)])
 
         ubi_attach = reset_overlay
 
+        # all commands are run at once in one remote session
+        commands = []
+
         if ubi_attach:
             firmware_mtd = self._get_firmware_mtd(self._config.bos.firmware)
-            ssh.run('ubiattach', '-p', firmware_mtd)
+            commands.append(['ubiattach', '-p', firmware_mtd])
 
         if reset_uboot_env:
             logging.info("Erasing NAND partition 'uboot_env'...")
-            ssh.run('mtd', 'erase', 'uboot_env')
+            commands.append(['mtd', 'erase', 'uboot_env'])
 
         # truncate overlay for current firmware
         if reset_overlay:
             logging.info("Truncating UBI volume 'rootfs_data'...")
-            ssh.run('ubiupdatevol', '/dev/ubi0_2', '-t')
+            commands.append(['ubiupdatevol', '/dev/ubi0_2', '-t'])
 
         if ubi_attach:
-            ssh.run('ubidetach', '-p', firmware_mtd)
+            commands.append(['ubidetach', '-p', firmware_mtd])
+
+        if commands:
+            ssh.run_all(*commands)
 
     def _deploy_ssh(self, images, sd_config: bool, nand_config: bool):
         """
@@ -1502,13 +1851,15 @@ class Builder:
         :param nand_config:
             Modify configuration files/partitions on NAND.
         """
-        hostname = self._config.deploy.ssh.get('hostname', None) or self._config.net.get('hostname', None)
-        password = self._config.deploy.ssh.get('password', None)
-        username = self._config.deploy.ssh.username
+        ssh_config = self._config.deploy.ssh
+        hostname = ssh_config.get('hostname', None) or self._config.net.get('hostname', None)
+        password = ssh_config.get('password', None)
+        username = ssh_config.username
+        reboot = self._config.deploy.reboot == 'yes'
 
         if not hostname:
             # when hostname is not set, use standard name derived from MAC address
-            hostname_suffix = self._config.deploy.ssh.get('hostname_suffix', '')
+            hostname_suffix = ssh_config.get('hostname_suffix', '')
             hostname = self._get_hostname() + hostname_suffix
 
         with SSHManager(hostname, username, password) as ssh:
@@ -1521,7 +1872,7 @@ class Builder:
             sd_recovery = image_sd and isinstance(image_sd, ImageRecovery)
 
             if image_sd:
-                self._deploy_ssh_sd(ssh, sftp, image_sd, sd_recovery)
+                self._deploy_ssh_sd(ssh, image_sd, sd_recovery)
             if sd_config:
                 self._config_ssh_sd(ssh, sftp, sd_recovery)
             if image_nand_recovery:
@@ -1532,7 +1883,7 @@ class Builder:
                 self._config_ssh_nand(ssh)
 
             # reboot system if requested
-            if self._config.deploy.reboot == 'yes':
+            if reboot:
                 ssh.run('reboot')
 
             sftp.close()
@@ -2177,7 +2528,8 @@ class Builder:
         """
         platform = self._config.bos.platform
         platform_target, _ = self._split_platform(platform)
-        targets = self._config.deploy.targets
+        deploy_config = self._config.deploy
+        targets = deploy_config.targets
 
         logging.info("Start deploying bOS firmware...")
 
@@ -2224,7 +2576,7 @@ class Builder:
                 if aliased_target:
                     expanded_targets.update(aliased_target['targets'])
                     for config, value in aliased_target.get('configs') or []:
-                        setattr(self._config.deploy, config, value)
+                        setattr(deploy_config, config, value)
                 elif target not in supported_targets:
                     logging.error("Unsupported target '{}' for firmware image".format(target))
                     raise BuilderStop
@@ -2337,71 +2689,117 @@ class Builder:
         commits_behind = sum(1 for _ in repo.iter_commits('{0}..{0}@{{u}}'.format(branch_name)))
         return commits_ahead, commits_behind
 
+    def _repo_status(self, name: str, repo):
+        """
+        Return status of one repository
+
+        The output is formatted into a buffer so that the status of several repositories can be gathered concurrently
+        and printed without interleaving.
+
+        :param name:
+            The name of repository as it has been specified in configuration file.
+        :param repo:
+            Opened git repository or None when it is missing or corrupted.
+        :return:
+            Triplet with logging level, header message and formatted status.
+        """
+        output = io.StringIO()
+        if not repo:
+            print('missing or corrupted repository', file=output)
+            print(file=output)
+            return logging.WARNING, "Status for '{}'".format(name), output.getvalue()
+
+        # get branch information and all changes with one git command
+        status = repo.git.status('--porcelain=v2', '-z', '--branch', '--untracked-files=all')
+
+        branch = {}
+        indexed_files = []
+        staged_files = []
+        untracked_files = []
+        entries = iter(status.split('\0'))
+        for entry in entries:
+            if entry.startswith('# '):
+                key, value = entry[2:].split(' ', 1)
+                branch[key] = value
+            elif entry.startswith('1 '):
+                fields = entry.split(' ', 8)
+                indexed, staged = fields[1]
+                indexed_files.append((indexed, fields[8]))
+                staged_files.append((staged, fields[8]))
+            elif entry.startswith('2 '):
+                fields = entry.split(' ', 9)
+                indexed, staged = fields[1]
+                # renamed or copied entry is followed by the original path
+                path = '{} -> {}'.format(next(entries), fields[9])
+                indexed_files.append((indexed, path))
+                staged_files.append((staged, path))
+            elif entry.startswith('u '):
+                staged_files.append(('U', entry.split(' ', 10)[10]))
+            elif entry.startswith('? '):
+                untracked_files.append(entry[2:])
+        indexed_files = [(change_type, path) for change_type, path in indexed_files if change_type != '.']
+        staged_files = [(change_type, path) for change_type, path in staged_files if change_type != '.']
+
+        working_dir = os.path.relpath(repo.working_dir, os.getcwd())
+        detached = branch.get('branch.head') == '(detached)'
+        branch_name = branch.get('branch.head') if not detached else \
+            'HEAD detached at {}'.format(branch.get('branch.oid', '')[:8])
+        message = "Status for '{}': '{}' ({})".format(name, working_dir, branch_name)
+        if not detached:
+            upstream = branch.get('branch.upstream')
+            if not upstream:
+                print(colored("The current branch '{}' has no upstream branch."
+                              .format(branch_name), 'magenta'), file=output)
+            elif 'branch.ab' in branch:
+                commits_ahead, commits_behind = (abs(int(count)) for count in branch['branch.ab'].split())
+                if commits_ahead and commits_behind:
+                    print(colored("Your branch and '{}' have diverged,".format(upstream), 'magenta'), file=output)
+                    print(colored("and have {} and {} different commits each, respectively."
+                                  .format(commits_ahead, commits_behind), 'magenta'), file=output)
+                elif commits_ahead:
+                    print(colored("Your branch is ahead of '{}' by {} commit."
+                                  .format(upstream, commits_ahead), 'magenta'), file=output)
+                elif commits_behind:
+                    print(colored("Your branch is behind '{}' by {} commit, and can be fast-forwarded."
+                                  .format(upstream, commits_behind), 'magenta'), file=output)
+        clean = True
+        if indexed_files:
+            print('Changes to be committed:', file=output)
+            for change_type, path in indexed_files:
+                print('\t{}'.format(change_type), colored(path, 'green'), file=output)
+            print(file=output)
+            clean = False
+        if staged_files:
+            print('Changes not staged for commit:', file=output)
+            for change_type, path in staged_files:
+                print('\t{}'.format(change_type), colored(path, 'red'), file=output)
+            print(file=output)
+            clean = False
+        if untracked_files:
+            print('Untracked files:', file=output)
+            for untracked_file in untracked_files:
+                print(colored('\t{}'.format(untracked_file), 'red'), file=output)
+            print(file=output)
+            clean = False
+        if clean:
+            print('nothing to commit, working tree clean', file=output)
+            print(file=output)
+        return logging.INFO, message, output.getvalue()
+
     def status(self):
         """
         Show status of all repositories
 
         It is equivalent of `git status` and shows all changes in related projects.
+        The status of all repositories is gathered in parallel and printed in the order of configuration.
         """
-        def get_diff_path(diff):
-            if diff.change_type[0] == 'R':
-                return '{} -> {}'.format(diff.a_path, diff.b_path)
-            else:
-                return diff.a_path
-
-        for name, repo in self._repos.items():
-            if not repo:
-                logging.warning("Status for '{}'".format(name))
-                print('missing or corrupted repository')
-                print()
-                continue
-
-            working_dir = os.path.relpath(repo.working_dir, os.getcwd())
-            branch_name = repo.active_branch.name if not repo.head.is_detached else \
-                'HEAD detached at {}'.format(repo.head.object.hexsha[:8])
-            logging.info("Status for '{}': '{}' ({})".format(name, working_dir, branch_name))
-            if not repo.head.is_detached:
-                if not repo.active_branch.tracking_branch():
-                    print(colored("The current branch '{}' has no upstream branch."
-                                  .format(branch_name), 'magenta'))
-                else:
-                    commits_ahead, commits_behind = self._count_commits(repo, branch_name)
-                    if commits_ahead and commits_behind:
-                        print(colored("Your branch and 'origin/{}' have diverged,".format(branch_name), 'magenta'))
-                        print(colored("and have {} and {} different commits each, respectively."
-                                      .format(commits_ahead, commits_behind), 'magenta'))
-                    elif commits_ahead:
-                        print(colored("Your branch is ahead of 'origin/{}' by {} commit."
-                                      .format(branch_name, commits_ahead), 'magenta'))
-                    elif commits_behind:
-                        print(colored("Your branch is behind 'origin/{}' by {} commit, and can be fast-forwarded."
-                                      .format(branch_name, commits_behind), 'magenta'))
-            clean = True
-            indexed_files = repo.head.commit.diff()
-            if len(indexed_files):
-                print('Changes to be committed:')
-                for indexed_file in indexed_files:
-                    change_type = indexed_file.change_type[0]
-                    print('\t{}'.format(change_type), colored(get_diff_path(indexed_file), 'green'))
-                print()
-                clean = False
-            staged_files = repo.index.diff(None)
-            if len(staged_files):
-                print('Changes not staged for commit:')
-                for staged_file in staged_files:
-                    change_type = staged_file.change_type[0]
-                    print('\t{}'.format(change_type), colored(get_diff_path(staged_file), 'red'))
-                print()
-                clean = False
-            if len(repo.untracked_files):
-                print('Untracked files:')
-                for untracked_file in repo.untracked_files:
-                    print(colored('\t{}'.format(untracked_file), 'red'))
-                print()
-                clean = False
-            if clean:
-                print('nothing to commit, working tree clean')
-                print()
+        jobs = max(1, min(len(self._repos), self.STATUS_JOBS_MAX))
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            statuses = executor.map(lambda item: self._repo_status(*item), self._repos.items())
+            for level, message, output in statuses:
+                logging.log(level, message)
+                sys.stdout.write(output)
+                sys.stdout.flush()
 
     def debug(self):
         """
@@ -2499,7 +2897,7 @@ class Builder:
 
         def checkout_repo(repo, name, uri, branch):
             logging.info("Checkout repository '{}' to branch {}...".format(name, branch))
-            self._checkout_repo(repo, RemoteWalker.Remote(name, uri, branch, True))
+            self._checkout_repo(repo, RemoteWalker.Remote(name, uri, branch, True, False))
 
         def get_repo(name, location, project, branch):
             # expand server with original config formatter
@@ -2514,7 +2912,7 @@ class Builder:
                 # directory contains different remote repository
                 shutil.rmtree(repo_path, ignore_errors=True)
             logging.info("Cloning repository '{}'...".format(name))
-            repo = git.Repo.clone_from(uri, repo_path, progress=RepoProgressPrinter())
+            repo = self._clone_repo(uri, repo_path, progress=RepoProgressPrinter())
             checkout_repo(repo, name, uri, branch)
             return repo
 
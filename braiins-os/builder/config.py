@@ -404,7 +404,7 @@ class RemoteWalker:
     """
     Iterator class for access remote repositories in configuration file
     """
-    Remote = namedtuple('Remote', ['name', 'uri', 'branch', 'fetch'])
+    Remote = namedtuple('Remote', ['name', 'uri', 'branch', 'fetch', 'shallow'])
 
     def __init__(self, remote, platform):
         """
@@ -421,13 +421,14 @@ class RemoteWalker:
         self._branch = remote.get('branch', 'master')
         self._fetch = remote.get('fetch', 'yes')
         self._fetch_force = remote.fetch_always == 'yes'
+        self._shallow = remote.get('shallow', 'no')
 
     def __iter__(self):
         """
         Return generator object as an iterator
 
         :return:
-            Items are named tuples with `name`, `uri`, `branch` and `fetch` attribute.
+            Items are named tuples with `name`, `uri`, `branch`, `fetch` and `shallow` attribute.
         """
         for name, repo in self.repos.items():
             remote_attributes = {
@@ -456,7 +457,8 @@ class RemoteWalker:
             server = self._aliases[location]
             uri = '{}/{}'.format(server, project)
             fetch = self._fetch_force or repo.get('fetch', self._fetch) == 'yes'
-            yield self.Remote(name, uri, branch, fetch)
+            shallow = repo.get('shallow', self._shallow) == 'yes'
+            yield self.Remote(name, uri, branch, fetch, shallow)
 
 
 def load_config(path: str):
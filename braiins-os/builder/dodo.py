@@ -22,6 +22,8 @@
 
 # global configuration set outside
 builder = None
+# number of tasks run simultaneously
+jobs = 1
 
 
 def _get_sub_task(name, generator, task_dep=None) -> dict:
@@ -59,7 +61,7 @@ def task_clone():
     """
     Task responsible for initial cloning of all repositories
     """
-    for clone_repo in builder.clone_repos_doit():
+    for clone_repo in builder.clone_repos_doit(progress=jobs == 1):
         yield _get_sub_task(None, clone_repo)
 
 
@@ -68,25 +70,44 @@ def task_checkout():
     Task responsible for switching all repositories to requested branch or commit
     """
     for checkout_repo in builder.checkout_repos_doit():
-        yield _get_sub_task(None, checkout_repo, ['clone'])
+        task = _get_sub_task(None, checkout_repo)
+        # each repository waits only for its own clone
+        task['task_dep'] = ['clone:{}'.format(task['name'])]
+        yield task
 
 
 def task_prepare():
     """
     Task responsible for preparation of LEDE build system
-    """
-    yield _get_sub_task('feeds_conf', builder.prepare_feeds_conf_doit(), ['checkout'])
-    yield _get_sub_task('feeds_update', builder.prepare_feeds_update_doit(), ['prepare:feeds_conf'])
 
-    feeds_tasks = []
+    Tasks depend only on repositories which they really use so they can be run in parallel with preparation of
+    other repositories.
+    """
+    feeds_repos = builder.get_feeds_repos()
+    if feeds_repos is None:
+        # some feeds cannot be assigned to any repository so wait for all of them
+        feeds_checkout = ['checkout']
+    else:
+        feeds_checkout = ['checkout:{}'.format(name) for name in feeds_repos]
+
+    yield _get_sub_task('feeds_conf', builder.prepare_feeds_conf_doit(), ['checkout:{}'.format(builder.REPO_LEDE)])
+    yield _get_sub_task('feeds_update', builder.prepare_feeds_update_doit(), ['prepare:feeds_conf'] + feeds_checkout)
+
+    # feeds are installed sequentially because LEDE scripts share temporary files
+    # and tasks can be run in parallel
+    feeds_task = 'prepare:feeds_update'
     for prepare_feeds in builder.prepare_feeds_doit():
-        task = _get_sub_task(None, prepare_feeds, ['prepare:feeds_update'])
+        task = _get_sub_task(None, prepare_feeds, [feeds_task])
         task['name'] = 'feeds_install:{}'.format(task['name'])
-        feeds_tasks.append('prepare:{}'.format(task['name']))
+        feeds_task = 'prepare:{}'.format(task['name'])
         yield task
 
-    yield _get_sub_task('default_config', builder.prepare_default_config_doit(), feeds_tasks)
-    yield _get_sub_task('config', builder.prepare_config_doit(), ['prepare:default_config'])
+    yield _get_sub_task('default_config', builder.prepare_default_config_doit(), [feeds_task])
+    # configuration refers to all external repositories
+    yield _get_sub_task('config', builder.prepare_config_doit(), ['prepare:default_config', 'checkout'])
 
+    key_task = 'prepare:config'
     for prepare_key in builder.prepare_keys_doit():
-        yield _get_sub_task(None, prepare_key, ['prepare:config'])
+        task = _get_sub_task(None, prepare_key, [key_task])
+        key_task = 'prepare:{}'.format(task['name'])
+        yield task
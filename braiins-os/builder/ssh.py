@@ -83,6 +83,20 @@ class SSHManager:
 
         self._client.set_missing_host_key_policy(paramiko.WarningPolicy())
 
+    @property
+    def hostname(self) -> str:
+        """
+        Return name of the SSH server
+        """
+        return self._hostname
+
+    @property
+    def username(self) -> str:
+        """
+        Return name of the user used for authentication
+        """
+        return self._username
+
     def _connect(self):
         """
         Connect to an SSH server and authenticate to it
@@ -233,6 +247,17 @@ class SSHManager:
         self._check_exit_status(cmd, stdout, stderr)
         return stdout, stderr
 
+    def run_all(self, *commands):
+        """
+        Run several system commands on remote system in one session
+
+        The commands are run sequentially and remaining commands are skipped when any command fails.
+
+        :param commands:
+            Commands where each one is a list with the program and its arguments.
+        """
+        return self.run(' && '.join(self._get_cmd(command) for command in commands))
+
     def put(self, local_path, remote_path):
         """
         Copy local file to remote server without SFTP server